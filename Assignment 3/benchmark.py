@@ -0,0 +1,273 @@
+# Author: Steven Tohme
+# Class: CP468 - Artificial Intelligence
+
+import argparse
+import cProfile
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+from itertools import product
+
+import numpy as np
+from part_2 import kMeans, kMeansModel, squaredDistanceChunks
+
+
+class PhaseTimer:
+    """
+    A class to accumulate wall time spent in each phase of a k-means run
+
+    """
+    def __init__(self) -> None:
+        self.totals = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Times the enclosed block and adds it to the total for the phase
+
+        Parameters:
+        ----------
+            name (str): Name of the phase, e.g. seeding, assignment or update
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+
+
+def makeBlobs(n: int, d: int, k: int, seed: int, spread: float = 1.0, box: float = 10.0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Generates a dataset of Gaussian blobs around randomly placed centres
+
+    Parameters:
+    ----------
+        n (int): Amount of points
+        d (int): Amount of dimensions
+        k (int): Amount of blobs
+        seed (int): Seed for the random generator
+        spread (float): Standard deviation of each blob
+        box (float): Centres are drawn uniformly from [-box, box] in every dimension
+
+    Returns:
+    ----------
+        tuple[np.ndarray, np.ndarray]: (n, d) points and the blob each point was drawn from
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(-box, box, size=(k, d))
+    labels = rng.integers(0, k, size=n)
+    data = centres[labels] + rng.normal(0.0, spread, size=(n, d))
+    return data, labels
+
+def runReference(data: np.ndarray, k: int, seed: int, maxIterations: int, timer: PhaseTimer) -> tuple[np.ndarray, int, bool]:
+    """
+    Runs the kMeans class from part_2 one phase at a time, mirroring kMeansAlgorithm
+
+    Parameters:
+    ----------
+        data (np.ndarray): (n, 2) points to cluster
+        k (int): Amount of centroids
+        seed (int): Seed for centroid initialization
+        maxIterations (int): Iteration cap in case the centroids never settle
+        timer (PhaseTimer): Timer to record the seeding, loop, assignment and update phases in
+
+    Returns:
+    ----------
+        tuple[np.ndarray, int, bool]: Final centroids, iterations run and whether they converged
+    """
+    if data.shape[1] != 2:
+        raise ValueError("the reference engine only supports 2 dimensions")
+
+    worker = kMeans(k, data[:, 0], data[:, 1])
+    random.seed(seed)
+    with timer.phase('seeding'):
+        worker.initializeCentroids()
+
+    iterationCount = 0
+    converged = False
+    with timer.phase('loop'):
+        while iterationCount < maxIterations:
+            iterationCount += 1
+            prev = worker.centroids
+            with timer.phase('assignment'):
+                worker.assignCentroids()
+            with timer.phase('update'):
+                worker.adjustCentroids()
+            if prev == worker.centroids:
+                converged = True
+                break
+
+    return kMeansModel.asArray(worker.centroids), iterationCount, converged
+
+# Engines take (data, k, seed, maxIterations, timer) and return (centroids, iterations, converged).
+# They record 'seeding', 'assignment' and 'update' phases, plus a 'loop' phase around the whole
+# iteration loop so setup such as data conversion is left out of the per-iteration figures.
+ENGINES = {
+    'reference': runReference,
+}
+
+def calcInertia(data: np.ndarray, centroids: np.ndarray) -> float:
+    """
+    Calculates the sum of squared distances from every point to its closest centroid
+
+    Parameters:
+    ----------
+        data (np.ndarray): (n, d) points
+        centroids (np.ndarray): (k, d) centroids
+
+    Returns:
+    ----------
+        float: The inertia of the clustering
+    """
+    return float(sum(squared.min(axis=1).sum() for _, squared in squaredDistanceChunks(data, centroids)))
+
+def benchmarkCase(engine: str, n: int, d: int, k: int, seed: int, maxIterations: int = 300,
+                  measureMemory: bool = True, profileDir: str = None) -> dict:
+    """
+    Times one engine on one generated dataset
+
+    Parameters:
+    ----------
+        engine (str): Key of the engine in ENGINES
+        n (int): Amount of points
+        d (int): Amount of dimensions
+        k (int): Amount of blobs and centroids
+        seed (int): Seed shared by data generation and centroid initialization
+        maxIterations (int): Iteration cap passed to the engine
+        measureMemory (bool): Whether to repeat the run under tracemalloc to record peak memory
+        profileDir (str): If given, a cProfile dump of the run is written to this directory
+                          (the recorded timings then include profiler overhead)
+
+    Returns:
+    ----------
+        dict: Timings, iterations, inertia and peak memory of the run
+
+    Raises:
+    ----------
+        ValueError: If maxIterations is less than 1. Invalid n, d or k are recorded as a failed run
+    """
+    if maxIterations < 1:
+        raise ValueError("maxIterations must be at least 1")
+
+    result = {'engine': engine, 'n': n, 'd': d, 'k': k, 'seed': seed}
+    timer = PhaseTimer()
+    profiler = cProfile.Profile() if profileDir else None
+
+    try:
+        data, _ = makeBlobs(n, d, k, seed)
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        centroids, iterations, converged = ENGINES[engine](data, k, seed, maxIterations, timer)
+        total = time.perf_counter() - start
+    except (ValueError, ZeroDivisionError) as error:
+        result.update(status='failed', error=str(error) or type(error).__name__)
+        return result
+    finally:
+        if profiler:
+            profiler.disable()
+
+    if profiler:
+        os.makedirs(profileDir, exist_ok=True)
+        profiler.dump_stats(os.path.join(profileDir, f"{engine}-n{n}-d{d}-k{k}-s{seed}.prof"))
+
+    result.update(
+        status='ok',
+        iterations=iterations,
+        converged=converged,
+        inertia=calcInertia(data, centroids),
+        seconds={name: timer.totals.get(name, 0.0) for name in ('seeding', 'loop', 'assignment', 'update')},
+        totalSeconds=total,
+        secondsPerIteration={
+            'assignment': timer.totals.get('assignment', 0.0) / iterations,
+            'update': timer.totals.get('update', 0.0) / iterations,
+            'loop': timer.totals.get('loop', 0.0) / iterations,
+        },
+    )
+
+    if measureMemory:
+        tracemalloc.start()
+        try:
+            ENGINES[engine](data, k, seed, maxIterations, PhaseTimer())
+            result['peakMemoryBytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+def runBenchmarks(engines: list[str], ns: list[int], ds: list[int], ks: list[int], seeds: list[int], **options) -> dict:
+    """
+    Runs every combination of engine, n, d, k and seed
+
+    Parameters:
+    ----------
+        engines (list[str]): Keys of the engines to run
+        ns (list[int]): Dataset sizes
+        ds (list[int]): Dimensions
+        ks (list[int]): Amounts of clusters
+        seeds (list[int]): Seeds, shared by every engine so results are comparable
+        **options: Passed on to benchmarkCase
+
+    Returns:
+    ----------
+        dict: Environment details and one result per combination
+    """
+    results = []
+    for n, d, k, seed, engine in product(ns, ds, ks, seeds, engines):
+        results.append(benchmarkCase(engine, n, d, k, seed, **options))
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+def positiveInt(value: str) -> int:
+    """
+    Parses a command line argument that must be a whole number of at least 1
+
+    Parameters:
+    ----------
+        value (str): The raw argument
+
+    Returns:
+    ----------
+        int: The parsed number
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark k-means engines on Gaussian blob datasets")
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--n', nargs='+', type=positiveInt, default=[1000, 10000])
+    parser.add_argument('--d', nargs='+', type=positiveInt, default=[2])
+    parser.add_argument('--k', nargs='+', type=positiveInt, default=[3, 8])
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0, 1, 2])
+    parser.add_argument('--max-iterations', type=positiveInt, default=300)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--profile-dir', help="write a cProfile dump per run to this directory")
+    parser.add_argument('--output', default='benchmark.json')
+    args = parser.parse_args()
+
+    report = runBenchmarks(args.engines, args.n, args.d, args.k, args.seeds,
+                           maxIterations=args.max_iterations, measureMemory=not args.no_memory,
+                           profileDir=args.profile_dir)
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    for result in report['results']:
+        if result['status'] == 'ok':
+            print(f"{result['engine']} n={result['n']} d={result['d']} k={result['k']} seed={result['seed']}: "
+                  f"{result['iterations']} iterations, {result['totalSeconds']:.3f}s, inertia {result['inertia']:.1f}")
+        else:
+            print(f"{result['engine']} n={result['n']} d={result['d']} k={result['k']} seed={result['seed']}: {result['error']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+# Author: Steven Tohme
+# Class: CP468 - Artificial Intelligence
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+
+def cachePath(path: str, columns: tuple[str, str]) -> str:
+    """
+    Returns the location of the binary cache for a CSV file and column pair
+
+    The column names are hashed so that no two column pairs share a file name.
+
+    Parameters:
+    ----------
+        path (str): Location of the CSV file
+        columns (tuple[str, str]): Names of the columns that were loaded
+
+    Returns:
+    ----------
+        str: Location of the .npy cache file
+    """
+    key = hashlib.sha1(json.dumps(list(columns)).encode()).hexdigest()[:16]
+    return f"{path}.{key}.npy"
+
+def parseCSV(path: str, columns: tuple[str, str]) -> np.ndarray:
+    """
+    Parses the requested columns of a CSV file into a contiguous array
+
+    Parameters:
+    ----------
+        path (str): Location of the CSV file
+        columns (tuple[str, str]): Names of the horizontal and vertical columns
+
+    Returns:
+    ----------
+        np.ndarray: (n, 2) float array with every NaN or infinite row removed
+    """
+    try:
+        frame = pd.read_csv(path, usecols=list(columns), dtype=np.float64)
+    except ValueError as error:
+        raise ValueError(f"{path}: could not read numeric columns {list(columns)}: {error}") from error
+
+    data = np.ascontiguousarray(frame[list(columns)].to_numpy(dtype=np.float64))
+    return data[np.isfinite(data).all(axis=1)]
+
+def sourceStamp(path: str, columns: tuple[str, str]) -> dict:
+    """
+    Returns the columns loaded and the size and modification time of a file, used to tell if a cache is stale
+
+    Parameters:
+    ----------
+        path (str): Location of the file
+        columns (tuple[str, str]): Names of the columns that were loaded
+
+    Returns:
+    ----------
+        dict: The column names, size in bytes and modification time in nanoseconds
+    """
+    stat = os.stat(path)
+    return {'columns': list(columns), 'size': stat.st_size, 'mtimeNs': stat.st_mtime_ns}
+
+def readStamp(path: str) -> dict:
+    """
+    Reads the stamp saved next to a cache file
+
+    Parameters:
+    ----------
+        path (str): Location of the stamp file
+
+    Returns:
+    ----------
+        dict: The saved stamp, or None if it is missing or unreadable
+    """
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def writeCache(binaryPath: str, stampPath: str, data: np.ndarray, stamp: dict) -> None:
+    """
+    Writes the parsed array and the stamp of the CSV it came from
+
+    The old stamp is removed first so a half-written cache is never treated as fresh.
+
+    Parameters:
+    ----------
+        binaryPath (str): Location of the .npy cache file
+        stampPath (str): Location of the stamp file
+        data (np.ndarray): The parsed points
+        stamp (dict): Columns, size and modification time of the CSV
+    """
+    if os.path.exists(stampPath):
+        os.remove(stampPath)
+
+    suffix = f".{os.getpid()}.tmp"
+    try:
+        with open(binaryPath + suffix, 'wb') as file:
+            np.save(file, data)
+        os.replace(binaryPath + suffix, binaryPath)
+        with open(stampPath + suffix, 'w') as file:
+            json.dump(stamp, file)
+        os.replace(stampPath + suffix, stampPath)
+    finally:
+        for tempPath in (binaryPath + suffix, stampPath + suffix):
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+
+def loadPoints(path: str, columns: tuple[str, str] = ('f1', 'f2'), cache: bool = True) -> np.ndarray:
+    """
+    Loads k-means input data, reusing a memory-mapped binary copy when one is up to date
+
+    The first call parses the CSV and writes the cleaned array next to it, along with the
+    column names and the size and modification time of the CSV. Later calls map that file
+    straight into memory as long as all three still match exactly. If the cache cannot be
+    written, the parsed array is returned without caching.
+
+    Parameters:
+    ----------
+        path (str): Location of the CSV file
+        columns (tuple[str, str]): Names of the horizontal and vertical columns
+        cache (bool): Whether to read and write the binary cache
+
+    Returns:
+    ----------
+        np.ndarray: Writable (n, 2) float array of points. A memory-mapped result is
+                    copy-on-write, so edits to it never reach the cache file
+    """
+    if not cache:
+        return parseCSV(path, columns)
+
+    binaryPath = cachePath(path, columns)
+    stampPath = f"{binaryPath}.json"
+    stamp = sourceStamp(path, columns)
+    if os.path.exists(binaryPath) and readStamp(stampPath) == stamp:
+        return np.load(binaryPath, mmap_mode='c')
+
+    data = parseCSV(path, columns)
+    try:
+        writeCache(binaryPath, stampPath, data, stamp)
+    except OSError:
+        return data
+    return np.load(binaryPath, mmap_mode='c')
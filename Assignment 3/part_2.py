@@ -1,9 +1,12 @@
 # Author: Steven Tohme
 # Class: CP468 - Artificial Intelligence
 
+import numpy as np
 import pandas as pd
 from random import randint
 
+CHUNK_SIZE = 65536
+
 class Point:
     """
     A class to represent a point in 2D space
@@ -84,16 +87,14 @@ class kMeans:
 
         Parameters:
         ----------
-            data (pandas Dataframe): The data to be converted to a list of points
+            X_data (pd.Series | np.ndarray): Horizontal values of data points
+            Y_data (pd.Series | np.ndarray): Vertical values of data points
 
         Returns:
         ----------
             list[point]: A list of points
         """
-        points = []
-        for i in range(len(X_data)):
-            points.append(Point(X_data[i], Y_data[i]))
-        return points
+        return [Point(x, y) for x, y in zip(X_data, Y_data)]
     
     def initializeCentroids(self) -> None:
         """
@@ -173,3 +174,199 @@ def kMeansAlgorithm(k: int, X_data: pd.Series, Y_data: pd.Series) -> dict:
         prev = worker.centroids
     
     return worker.assignedData
+
+
+def squaredDistanceChunks(data: np.ndarray, centroids: np.ndarray, chunkSize: int = CHUNK_SIZE):
+    """
+    Yields the squared Euclidian distance from every point to every centroid, a chunk of points at a time
+
+    Parameters:
+    ----------
+        data (np.ndarray): (n, d) points
+        centroids (np.ndarray): (k, d) centroids
+        chunkSize (int): Amount of points processed at once
+
+    Yields:
+    ----------
+        tuple[int, np.ndarray]: Index of the first point in the chunk and its (chunk, k) squared distances
+    """
+    for start in range(0, len(data), chunkSize):
+        diff = data[start:start + chunkSize, np.newaxis, :] - centroids[np.newaxis, :, :]
+        yield start, np.einsum('ijk,ijk->ij', diff, diff)
+
+
+class kMeansModel:
+    """
+    A class to represent a fitted k-means model
+
+    """
+    def __init__(self, centroids: np.ndarray, labels: np.ndarray = None) -> None:
+        """
+        Constructor for fitted model class
+
+        Parameters:
+        ----------
+            centroids (np.ndarray): (k, 2) array of centroid coordinates
+            labels (np.ndarray): Index of the assigned centroid for each training point
+        
+        """
+        self.centroids = np.ascontiguousarray(self.asArray(centroids))
+        if labels is None:
+            labels = np.empty(0, dtype=np.intp)
+        self.labels = np.asarray(labels, dtype=np.intp)
+        self.k = len(self.centroids)
+
+    @staticmethod
+    def asArray(points) -> np.ndarray:
+        """
+        Converts a batch of points to an (n, 2) float array
+
+        Parameters:
+        ----------
+            points (np.ndarray | pd.DataFrame | list[Point]): A single point or an (n, 2) batch of points
+
+        Returns:
+        ----------
+            np.ndarray: (n, 2) array of coordinates
+
+        Raises:
+        ----------
+            ValueError: If the points are not 2-dimensional
+        """
+        if isinstance(points, list) and points and isinstance(points[0], Point):
+            return np.array([(point.x, point.y) for point in points], dtype=np.float64)
+
+        data = np.asarray(points, dtype=np.float64)
+        if data.ndim == 1 and data.size in (0, 2):
+            return data.reshape(-1, 2)
+        if data.ndim != 2 or data.shape[1] != 2:
+            raise ValueError(f"expected a point or an (n, 2) array of points, got shape {data.shape}")
+        return data
+
+    def transform(self, points, chunkSize: int = CHUNK_SIZE) -> np.ndarray:
+        """
+        Calculates the Euclidian distance from every point to every centroid
+
+        Parameters:
+        ----------
+            points (np.ndarray | pd.DataFrame | list[Point]): The points to compare
+            chunkSize (int): Amount of points processed at once
+        
+        Returns:
+        ----------
+            np.ndarray: (n, k) array of distances
+        """
+        data = self.asArray(points)
+        distances = np.empty((len(data), self.k), dtype=np.float64)
+        for start, squared in squaredDistanceChunks(data, self.centroids, chunkSize):
+            np.sqrt(squared, out=distances[start:start + len(squared)])
+        return distances
+
+    def predict(self, points, chunkSize: int = CHUNK_SIZE) -> np.ndarray:
+        """
+        Assigns each point to the closest centroid according to Euclidian distance
+
+        Parameters:
+        ----------
+            points (np.ndarray | pd.DataFrame | list[Point]): The points to assign
+            chunkSize (int): Amount of points processed at once
+        
+        Returns:
+        ----------
+            np.ndarray: Index of the closest centroid for each point
+        """
+        data = self.asArray(points)
+        labels = np.empty(len(data), dtype=np.intp)
+        for start, squared in squaredDistanceChunks(data, self.centroids, chunkSize):
+            labels[start:start + len(squared)] = squared.argmin(axis=1)
+        return labels
+
+    def save(self, path: str) -> None:
+        """
+        Saves the centroids and labels to a binary .npz file
+
+        Parameters:
+        ----------
+            path (str): Location of the file to write
+        """
+        with open(path, 'wb') as file:
+            np.savez(file, centroids=self.centroids, labels=self.labels)
+
+    @classmethod
+    def load(cls, path: str) -> 'kMeansModel':
+        """
+        Loads a model previously written by save
+
+        Parameters:
+        ----------
+            path (str): Location of the file to read
+        
+        Returns:
+        ----------
+            kMeansModel: The loaded model
+        """
+        with np.load(path, allow_pickle=False) as file:
+            return cls(file['centroids'], file['labels'])
+
+def fitKMeans(k: int, X_data: pd.Series, Y_data: pd.Series) -> kMeansModel:
+    """
+    Runs K Means Clustering Algorithm and returns the fitted model
+
+    Parameters:
+    ----------
+        k (int): K-value, amount of centroids in our algorithm
+        X_data (pd.Series): Horizontal values of data points
+        Y_data (pd.Series): Vertical values of data points
+    
+    Returns:
+    ---------
+        kMeansModel: Model holding the final centroids and a label for every data point
+    """
+    assignedData = kMeansAlgorithm(k, X_data, Y_data)
+    model = kMeansModel(kMeansModel.asArray(list(assignedData)))
+    data = np.column_stack((np.asarray(X_data, dtype=np.float64), np.asarray(Y_data, dtype=np.float64)))
+    model.labels = model.predict(data)
+    return model
+
+def fitKMeansArray(k: int, data: np.ndarray) -> kMeansModel:
+    """
+    Runs K Means Clustering Algorithm directly on an array of points, e.g. from ingestion.loadPoints
+
+    Follows the same steps as kMeansAlgorithm, including drawing the initial centroids
+    with randint, but assigns and adjusts every centroid with array operations instead
+    of building a Point per row.
+
+    Parameters:
+    ----------
+        k (int): K-value, amount of centroids in our algorithm
+        data (np.ndarray): (n, 2) array of data points
+    
+    Returns:
+    ---------
+        kMeansModel: Model holding the final centroids and a label for every data point
+
+    Raises:
+    ----------
+        ValueError: If a centroid ends up with no points assigned to it
+    """
+    data = kMeansModel.asArray(data)
+    picked = data[[randint(0, len(data) - 1) for _ in range(k)]]
+
+    # kMeansAlgorithm keys clusters by centroid, so a centroid drawn twice only counts once
+    _, firstIndex = np.unique(picked, axis=0, return_index=True)
+    model = kMeansModel(picked[np.sort(firstIndex)])
+
+    while True:
+        labels = model.predict(data)
+        counts = np.bincount(labels, minlength=model.k)
+        if not counts.all():
+            raise ValueError("a centroid has no points assigned to it")
+
+        sums = np.column_stack([np.bincount(labels, weights=data[:, axis], minlength=model.k) for axis in range(2)])
+        newCentroids = sums / counts[:, np.newaxis]
+        if np.array_equal(newCentroids, model.centroids):
+            break
+        model.centroids = newCentroids
+
+    model.labels = labels
+    return model